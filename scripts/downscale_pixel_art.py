@@ -10,26 +10,41 @@ The script:
 
 Default behavior is `crop`: write out only the detected content bounding box.
 The existing downscale pipeline is kept around for later iterations.
+
+`--input` may also be a directory or a glob pattern, in which case every
+matching image is processed independently across a pool of worker processes.
 """
 
 from __future__ import annotations
 
 import argparse
-import math
+import contextlib
+import functools
+import glob
+import io
 import pathlib
-from typing import Iterable, List, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence, Tuple
 
 try:
-  from PIL import Image, ImageDraw
+  from PIL import Image, ImageChops, ImageDraw
 except ImportError as exc:  # pragma: no cover - depends on environment
   raise SystemExit(
       "Pillow is required to run this script. Install it with `pip install Pillow`."
   ) from exc
 
+try:
+  import numpy as np
+except ImportError as exc:  # pragma: no cover - depends on environment
+  raise SystemExit(
+      "NumPy is required to run this script. Install it with `pip install numpy`."
+  ) from exc
+
 Color = Tuple[int, int, int, int]
 BBox = Tuple[int, int, int, int]
 BACKGROUND_THRESHOLD = 24
 RUN_LENGTH_THRESHOLD = 4
+GENERATED_SUFFIXES = ("_cropped", "_downscaled", "_grid_overlay", "_debug")
 
 
 def parse_args() -> argparse.Namespace:
@@ -51,14 +66,24 @@ def parse_args() -> argparse.Namespace:
       "-i",
       type=pathlib.Path,
       required=True,
-      help="Path to the source image.",
+      help="Path to the source image, or a directory / glob pattern for batch mode.",
   )
   parser.add_argument(
       "--output",
       "-o",
       type=pathlib.Path,
       default=None,
-      help="Destination path for the output image (default: derived from input).",
+      help=(
+          "Destination path for the output image, or the output directory in batch "
+          "mode (default: derived from input)."
+      ),
+  )
+  parser.add_argument(
+      "--jobs",
+      "-j",
+      type=int,
+      default=None,
+      help="Number of worker processes in batch mode (default: CPU count).",
   )
   parser.add_argument(
       "--size",
@@ -93,6 +118,14 @@ def parse_args() -> argparse.Namespace:
       action="store_true",
       help="If set, writes a debug image with the aligned grid overlay.",
   )
+  parser.add_argument(
+      "--fast-decode",
+      action="store_true",
+      help=(
+          "Downscale mode only: let JPEG decoding shrink the image by a power of two "
+          "that divides the pixel size. Faster on large inputs but not pixel-exact."
+      ),
+  )
   parser.add_argument(
       "--bg-threshold",
       "-b",
@@ -114,44 +147,59 @@ def parse_args() -> argparse.Namespace:
 
 
 def detect_content_bbox(
-    image: Image.Image, background_threshold: int = BACKGROUND_THRESHOLD
+    arr: np.ndarray,
+    background_threshold: int = BACKGROUND_THRESHOLD,
+    background_color: Color | None = None,
 ) -> BBox:
-  """Detect the bounding box of visible content."""
-  alpha = image.getchannel("A")
-  alpha_min, alpha_max = alpha.getextrema()
+  """Detect the bounding box of visible content in an RGBA array.
 
-  if alpha_max == 0:
+  Opaque images are compared against `background_color`, which is detected from
+  the border when not given.
+  """
+  alpha = arr[:, :, 3]
+  if alpha.max() == 0:
     raise ValueError("Image contains no visible pixels.")
 
-  if alpha_min < 255:
-    bbox = alpha.getbbox()
+  if alpha.min() < 255:
+    return _content_bbox(arr, None, background_threshold)
+
+  if background_color is None:
+    background_color = detect_background_color(arr)
+  return _content_bbox(
+      arr, np.array(background_color[:3], dtype=np.int16), background_threshold
+  )
+
+
+def _mask_bbox(mask: np.ndarray) -> BBox | None:
+  """Bounding box of the True entries of a 2D mask, or None if there are none."""
+  rows = np.flatnonzero(mask.any(axis=1))
+  if not rows.size:
+    return None
+  cols = np.flatnonzero(mask.any(axis=0))
+  return (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1)
+
+
+def _content_bbox(
+    arr: np.ndarray, background_rgb: Sequence[int] | None, background_threshold: int
+) -> BBox:
+  """Bbox of non-transparent pixels, or of non-background ones when a color is given."""
+  if background_rgb is None:
+    bbox = _mask_bbox(arr[:, :, 3] > 0)
     if bbox is None:
       raise ValueError("Image contains no visible pixels.")
     return bbox
 
-  width, height = image.size
-  bg = detect_background_color(image)
-
-  min_x, min_y = width, height
-  max_x, max_y = -1, -1
-
-  for idx, pixel in enumerate(image.getdata()):
-    if not _color_close(pixel, bg, threshold=background_threshold):
-      x = idx % width
-      y = idx // width
-      if x < min_x:
-        min_x = x
-      if y < min_y:
-        min_y = y
-      if x > max_x:
-        max_x = x
-      if y > max_y:
-        max_y = y
-
-  if max_x == -1:
+  # Per-channel |pixel - bg| thresholded in C; a pixel is content when any
+  # channel exceeds the threshold, which getbbox() picks up on the RGB mask.
+  image = Image.fromarray(arr, "RGBA").convert("RGB")
+  diff = ImageChops.difference(
+      image, Image.new("RGB", image.size, tuple(int(v) for v in background_rgb))
+  )
+  mask = diff.point(lambda v, t=background_threshold: 255 if v > t else 0)
+  bbox = mask.getbbox()
+  if bbox is None:
     raise ValueError("No content detected; image appears to be a solid color.")
-
-  return (min_x, min_y, max_x + 1, max_y + 1)
+  return bbox
 
 
 def expand_to_square(bbox: BBox, image_size: Tuple[int, int]) -> BBox:
@@ -177,73 +225,148 @@ def expand_to_square(bbox: BBox, image_size: Tuple[int, int]) -> BBox:
   return (new_left, new_top, new_left + side, new_top + side)
 
 
-def _color_close(a: Color, b: Color, threshold: int = BACKGROUND_THRESHOLD) -> bool:
-  """Cheap closeness check in RGB space."""
-  return (
-      abs(a[0] - b[0]) <= threshold and
-      abs(a[1] - b[1]) <= threshold and
-      abs(a[2] - b[2]) <= threshold
-  )
+def close_mask(
+    rgb: np.ndarray, background_rgb: Sequence[int], threshold: int
+) -> np.ndarray:
+  """Mask of pixels whose RGB channels are all within `threshold` of the background.
+
+  `rgb` is a uint8 array with the three color channels in its last axis. Pass
+  `background_rgb` as an int16 array to reuse it across calls without conversion.
+  """
+  diff = rgb.astype(np.int16)
+  diff -= np.asarray(background_rgb, dtype=np.int16)
+  np.abs(diff, out=diff)
+  return diff.max(axis=-1) <= threshold
 
 
-def detect_background_color(image: Image.Image) -> Color:
+def detect_background_color(arr: np.ndarray) -> Color:
   """Estimate the dominant background color from the border pixels."""
-  width, height = image.size
-  pixels = image.load()
-  bg_candidates = []
-  for x in range(width):
-    bg_candidates.append(pixels[x, 0])
-    bg_candidates.append(pixels[x, height - 1])
-  for y in range(height):
-    bg_candidates.append(pixels[0, y])
-    bg_candidates.append(pixels[width - 1, y])
-
-  opaque_candidates = [c for c in bg_candidates if len(c) >= 4 and c[3] >= 250]
-  if opaque_candidates:
-    bg_candidates = opaque_candidates
-
-  if not bg_candidates:
-    return (0, 0, 0, 0)
+  # Full edges on all four sides, so each corner is sampled twice.
+  border = np.concatenate([arr[0], arr[-1], arr[:, 0], arr[:, -1]], axis=0)
 
-  rs = sorted(c[0] for c in bg_candidates)
-  gs = sorted(c[1] for c in bg_candidates)
-  bs = sorted(c[2] for c in bg_candidates)
-  mid = len(bg_candidates) // 2
-  if len(bg_candidates) % 2 == 0:
-    r = (rs[mid - 1] + rs[mid]) // 2
-    g = (gs[mid - 1] + gs[mid]) // 2
-    b = (bs[mid - 1] + bs[mid]) // 2
-  else:
-    r = rs[mid]
-    g = gs[mid]
-    b = bs[mid]
+  if border.shape[-1] >= 4:
+    opaque = border[border[:, 3] >= 250]
+    if len(opaque):
+      border = opaque
+
+  if not len(border):
+    return (0, 0, 0, 0)
 
+  # np.median selects with introselect (O(N)); for an even count it averages the
+  # two middle values, and truncating that average gives their integer floor mean.
+  r, g, b = np.median(border[:, :3], axis=0).astype(int)
   return (int(r), int(g), int(b), 255)
 
 
 def make_background_transparent(
-    image: Image.Image, background_color: Color, threshold: int
-) -> Image.Image:
+    arr: np.ndarray, background_color: Color, threshold: int
+) -> np.ndarray:
+  """Return a copy of an RGBA array with background-colored pixels made transparent."""
   if threshold < 0:
     raise ValueError("Background threshold must be non-negative.")
 
-  output = image.copy()
-  data = list(output.getdata())
-  new_data: List[Color] = []
-  for pixel in data:
-    if pixel[3] == 0:
-      new_data.append(pixel)
+  output = arr.copy()
+  close = close_mask(output[:, :, :3], background_color[:3], threshold)
+  output[close & (output[:, :, 3] > 0), 3] = 0
+  return output
+
+
+def _scanline_segments(
+    lines: np.ndarray,
+    background_rgb: Sequence[int] | None,
+    background_threshold: int,
+) -> Tuple[List[List[int]], List[bool], List[int], List[bool]]:
+  """Collapse (L, N, 4) scanlines into spans of identical pixels.
+
+  Returns each span's RGB color, background flag, length, and whether it starts
+  a new scanline, flattened across all lines. Plain lists are returned since the
+  run-length pass walks them one span at a time.
+  """
+  num_lines, line_len = lines.shape[:2]
+  if line_len == 0:
+    return [], [], [], []
+
+  rgb = lines[:, :, :3]
+  if background_rgb is None:
+    is_bg = np.zeros((num_lines, line_len), dtype=np.bool_)
+  else:
+    is_bg = close_mask(rgb, background_rgb, background_threshold)
+
+  change = np.ones((num_lines, line_len), dtype=np.bool_)
+  change[:, 1:] = (
+      (rgb[:, 1:] != rgb[:, :-1]).any(axis=2) | (is_bg[:, 1:] != is_bg[:, :-1])
+  )
+
+  starts = np.flatnonzero(change)
+  lengths = np.diff(np.append(starts, change.size))
+  colors = rgb.reshape(-1, 3)[starts].astype(np.int64)
+  return (
+      colors.tolist(),
+      is_bg.ravel()[starts].tolist(),
+      lengths.tolist(),
+      (starts % line_len == 0).tolist(),
+  )
+
+
+def _accumulate_run_lengths(
+    colors: List[List[int]],
+    is_bg: List[bool],
+    lengths: List[int],
+    new_line: List[bool],
+    run_threshold: int,
+    histogram: List[int],
+) -> None:
+  """Add run lengths of near-identical, non-background spans to `histogram`.
+
+  A run keeps comparing against its first color; background spans end the
+  current run and are never counted. Runs longer than the histogram are dropped.
+  """
+  upper = len(histogram) - 1
+  last = 0
+  length = 0
+  last_is_bg = False
+
+  for i in range(len(lengths)):
+    if new_line[i]:
+      if 0 < length <= upper and not last_is_bg:
+        histogram[length] += 1
+      last = i
+      last_is_bg = is_bg[i]
+      length = 0 if is_bg[i] else lengths[i]
+      continue
+
+    if is_bg[i]:
+      if not last_is_bg and 0 < length <= upper:
+        histogram[length] += 1
+      last = i
+      last_is_bg = True
+      length = 0
       continue
-    if _color_close(pixel, background_color, threshold=threshold):
-      new_data.append((pixel[0], pixel[1], pixel[2], 0))
+
+    if last_is_bg:
+      last = i
+      last_is_bg = False
+      length = lengths[i]
+      continue
+
+    if (
+        abs(colors[i][0] - colors[last][0]) <= run_threshold and
+        abs(colors[i][1] - colors[last][1]) <= run_threshold and
+        abs(colors[i][2] - colors[last][2]) <= run_threshold
+    ):
+      length += lengths[i]
     else:
-      new_data.append(pixel)
-  output.putdata(new_data)
-  return output
+      if length <= upper:
+        histogram[length] += 1
+      last = i
+      length = lengths[i]
+
+  if 0 < length <= upper and not last_is_bg:
+    histogram[length] += 1
 
 
 def infer_pixel_size(
-    image: Image.Image,
+    arr: np.ndarray,
     bbox: BBox,
     target_size: int,
     background_color: Color | None = None,
@@ -251,6 +374,9 @@ def infer_pixel_size(
     background_threshold: int = BACKGROUND_THRESHOLD,
 ) -> int:
   """Infer the pixel size by histogramming run-lengths across sampled scanlines."""
+  if run_threshold < 0:
+    raise ValueError("Run threshold must be non-negative.")
+
   left, top, right, bottom = bbox
   width = right - left
   height = bottom - top
@@ -263,69 +389,24 @@ def infer_pixel_size(
   if not cols:
     cols = [left + width // 2]
 
-  pixels = image.load()
-  runs: List[int] = []
   expected_size = max(1, round(max(width, height) / float(target_size)))
-
-  def collect_run_lengths(line: Sequence[Color]) -> None:
-    if not line:
-      return
-    last = None
-    length = 0
-    last_is_bg = False
-
-    for color in line:
-      is_bg = (
-          background_color is not None and
-          _color_close(color, background_color, background_threshold)
-      )
-
-      if last is None:
-        last = color
-        last_is_bg = is_bg
-        length = 0 if is_bg else 1
-        continue
-
-      if is_bg:
-        if not last_is_bg and length > 0:
-          runs.append(length)
-        last = color
-        last_is_bg = True
-        length = 0
-        continue
-
-      if last_is_bg:
-        last = color
-        last_is_bg = False
-        length = 1
-        continue
-
-      if _color_close(color, last, threshold=run_threshold):
-        length += 1
-      else:
-        runs.append(length)
-        last = color
-        length = 1
-
-    if length > 0 and not last_is_bg:
-      runs.append(length)
-
-  for y in rows:
-    line = [pixels[x, y] for x in range(left, right)]
-    collect_run_lengths(line)
-  for x in cols:
-    line = [pixels[x, y] for y in range(top, bottom)]
-    collect_run_lengths(line)
-
   lower = max(1, expected_size // 4)
   upper = expected_size * 4
-  filtered = [r for r in runs if lower <= r <= upper]
-  if not filtered:
-    return expected_size
 
-  histogram = {}
-  for r in filtered:
-    histogram[r] = histogram.get(r, 0) + 1
+  background_rgb = None
+  if background_color is not None:
+    background_rgb = np.array(background_color[:3], dtype=np.int16)
+  counts = [0] * (upper + 1)
+  for lines in (arr[rows, left:right], arr[top:bottom, cols].transpose(1, 0, 2)):
+    _accumulate_run_lengths(
+        *_scanline_segments(lines, background_rgb, background_threshold),
+        run_threshold,
+        counts,
+    )
+
+  histogram = {r: counts[r] for r in range(lower, upper + 1) if counts[r]}
+  if not histogram:
+    return expected_size
 
   dominant_value, dominant_count = max(
       histogram.items(),
@@ -372,81 +453,93 @@ def align_sample_region(
            aligned_top + sample_size), pixel_size)
 
 
-def sample_centers(
-    image: Image.Image, region: BBox, target_size: int, pixel_size: int
-) -> List[Color]:
-  pixels = image.load()
-  left, top, _, _ = region
-  samples: List[Color] = []
+@functools.lru_cache(maxsize=32)
+def _cell_center_offsets(target_size: int, pixel_size: int) -> np.ndarray:
+  """Offsets of each cell center from the grid origin, shared across calls.
 
-  for y_index in range(target_size):
-    for x_index in range(target_size):
-      x = int((x_index + 0.5) * pixel_size) + left
-      y = int((y_index + 0.5) * pixel_size) + top
-      x = min(max(x, 0), image.width - 1)
-      y = min(max(y, 0), image.height - 1)
-      samples.append(pixels[x, y])
-
-  return samples
+  int((i + 0.5) * pixel_size) == i * pixel_size + pixel_size // 2 for integer
+  sizes, so no float math is needed.
+  """
+  offsets = np.arange(target_size, dtype=np.intp) * pixel_size + pixel_size // 2
+  offsets.setflags(write=False)
+  return offsets
 
 
-def normalize_rgb(color: Color) -> Tuple[float, float, float]:
-  r, g, b = color[:3]
-  return (r / 255.0, g / 255.0, b / 255.0)
+def sample_centers(
+    arr: np.ndarray, region: BBox, target_size: int, pixel_size: int
+) -> np.ndarray:
+  """Return the RGBA color at each grid cell center as a (target_size^2, 4) array."""
+  height, width = arr.shape[:2]
+  left, top, _, _ = region
+  offsets = _cell_center_offsets(target_size, pixel_size)
+  xs = np.clip(offsets + left, 0, width - 1)
+  ys = np.clip(offsets + top, 0, height - 1)
+  return arr[ys[:, None], xs[None, :]].reshape(-1, 4)
 
 
-def color_distance(a: Sequence[float], b: Sequence[float]) -> float:
-  return math.sqrt(
-      (a[0] - b[0]) ** 2 +
-      (a[1] - b[1]) ** 2 +
-      (a[2] - b[2]) ** 2
-  )
+def merge_palette(colors: np.ndarray, tolerance: float) -> np.ndarray:
+  """Snap each color to the first earlier palette entry within `tolerance`.
 
+  `tolerance` is a normalized RGB distance; comparisons are done on squared
+  integer distances in 0-255 space.
+  """
+  if tolerance < 0:
+    raise ValueError("Tolerance must be non-negative.")
 
-def merge_palette(colors: Iterable[Color], tolerance: float) -> List[Color]:
-  merged: List[Color] = []
-  palette: List[Tuple[Tuple[float, float, float], Color]] = []
-  threshold = tolerance
+  # Repeated colors always resolve like their first occurrence, so only the
+  # distinct colors (in order of first appearance) need the palette search.
+  unique_rgb, first_rows, inverse = np.unique(
+      colors[:, :3].astype(np.int32), axis=0, return_index=True, return_inverse=True
+  )
+  threshold_sq = int((tolerance * 255.0) ** 2)
+  palette = np.empty_like(unique_rgb)
+  palette_rows: List[int] = []
+  merged_rows = np.empty(len(unique_rgb), dtype=np.intp)
+
+  for index in np.argsort(first_rows):
+    color = unique_rgb[index]
+    count = len(palette_rows)
+    if count:
+      dist_sq = ((palette[:count] - color) ** 2).sum(axis=1)
+      matches = np.flatnonzero(dist_sq <= threshold_sq)
+      if matches.size:
+        merged_rows[index] = palette_rows[matches[0]]
+        continue
 
-  for color in colors:
-    normalized = normalize_rgb(color)
-    replacement = None
-    for ref_norm, ref_color in palette:
-      if color_distance(normalized, ref_norm) <= threshold:
-        replacement = ref_color
-        break
+    palette[count] = color
+    palette_rows.append(first_rows[index])
+    merged_rows[index] = first_rows[index]
 
-    if replacement is None:
-      palette.append((normalized, color))
-      replacement = color
+  return colors[merged_rows[inverse.reshape(-1)]]
 
-    merged.append(replacement)
 
-  return merged
+def write_output(path: pathlib.Path, size: int, pixels: np.ndarray) -> None:
+  arr = np.asarray(pixels, dtype=np.uint8).reshape(size, size, 4)
+  Image.fromarray(arr, "RGBA").save(path)
 
 
-def write_output(path: pathlib.Path, size: int, pixels: Sequence[Color]) -> None:
-  output = Image.new("RGBA", (size, size))
-  output.putdata(pixels)
-  output.save(path)
+def _paint_grid(
+    image: Image.Image, region: BBox, pixel_size: int, color: Color
+) -> Image.Image:
+  """Copy of `image` with every `pixel_size`-th row and column of `region` set to `color`."""
+  left, top, right, bottom = region
+  arr = np.array(image)
+  arr[top:bottom, left:right + 1:pixel_size] = color
+  arr[top:bottom + 1:pixel_size, left:right] = color
+  return Image.fromarray(arr, "RGBA")
 
 
 def write_debug_overlay(
     image: Image.Image, region: BBox, pixel_size: int, target_size: int, path: pathlib.Path
 ) -> None:
   """Overlay the sampling grid on top of the source image."""
-  overlay = image.copy()
-  draw = ImageDraw.Draw(overlay, "RGBA")
-
-  left, top, right, bottom = region
   grid_color = (255, 0, 0, 160)
   border_color = (0, 255, 0, 200)
 
-  for x in range(left, right + 1, pixel_size):
-    draw.line([(x, top), (x, bottom - 1)], fill=grid_color, width=1)
-  for y in range(top, bottom + 1, pixel_size):
-    draw.line([(left, y), (right - 1, y)], fill=grid_color, width=1)
+  overlay = _paint_grid(image, region, pixel_size, grid_color)
+  draw = ImageDraw.Draw(overlay, "RGBA")
 
+  left, top, right, bottom = region
   draw.rectangle([left, top, right - 1, bottom - 1], outline=border_color, width=2)
   draw.text((left + 4, top + 4), f"{target_size}x{target_size}", fill=border_color)
   overlay.save(path)
@@ -456,17 +549,10 @@ def write_grid_overlay(image: Image.Image, pixel_size: int, path: pathlib.Path)
   """Draw a grid over the full image starting at the top-left."""
   if pixel_size <= 0:
     raise ValueError("Pixel size must be positive to draw a grid.")
-  overlay = image.copy()
-  draw = ImageDraw.Draw(overlay, "RGBA")
   grid_color = (255, 0, 0, 160)
 
   width, height = image.size
-  for x in range(0, width + 1, pixel_size):
-    draw.line([(x, 0), (x, height)], fill=grid_color, width=1)
-  for y in range(0, height + 1, pixel_size):
-    draw.line([(0, y), (width, y)], fill=grid_color, width=1)
-
-  overlay.save(path)
+  _paint_grid(image, (0, 0, width, height), pixel_size, grid_color).save(path)
 
 
 def crop_to_content(
@@ -477,34 +563,113 @@ def crop_to_content(
     debug_grid: bool,
     run_threshold: int,
 ) -> None:
-  image = Image.open(input_path).convert("RGBA")
-  background_color = detect_background_color(image)
-  bbox = detect_content_bbox(image, background_threshold=background_threshold)
-  cropped = image.crop(bbox)
-
+  arr = np.asarray(Image.open(input_path).convert("RGBA"))
+  background_color = detect_background_color(arr)
+  bbox = detect_content_bbox(
+      arr, background_threshold=background_threshold, background_color=background_color
+  )
+  left, top, right, bottom = bbox
   cropped = make_background_transparent(
-      cropped, background_color=background_color, threshold=background_threshold
+      arr[top:bottom, left:right],
+      background_color=background_color,
+      threshold=background_threshold,
   )
+  cropped_height, cropped_width = cropped.shape[:2]
 
   inferred_pixel_size = infer_pixel_size(
       cropped,
-      (0, 0, cropped.width, cropped.height),
+      (0, 0, cropped_width, cropped_height),
       target_size=target_size,
       background_color=background_color,
       run_threshold=run_threshold,
       background_threshold=background_threshold,
   )
 
-  cropped.save(output_path)
-  print(f"Input: {image.width}x{image.height}")
+  cropped_image = Image.fromarray(cropped, "RGBA")
+  cropped_image.save(output_path)
+  print(f"Input: {arr.shape[1]}x{arr.shape[0]}")
   print(f"Background color: {background_color}")
   print(f"Content bbox: {bbox}")
   print(f"Inferred pixel size: {inferred_pixel_size}")
   if debug_grid:
     grid_path = grid_overlay_path(output_path)
-    write_grid_overlay(cropped, inferred_pixel_size, grid_path)
+    write_grid_overlay(cropped_image, inferred_pixel_size, grid_path)
     print(f"Wrote grid overlay to {grid_path}")
-  print(f"Wrote {output_path} ({cropped.width}x{cropped.height})")
+  print(f"Wrote {output_path} ({cropped_width}x{cropped_height})")
+
+
+def _analyze_and_sample(
+    arr: np.ndarray,
+    target_size: int,
+    pixel_size: int,
+    tolerance: float | None,
+    background_color: Color | None,
+    background_threshold: int,
+) -> Tuple[np.ndarray, BBox, BBox, BBox]:
+  """Run the downscale pipeline on an RGBA array.
+
+  Only the content bbox detection scans the full image; everything after it
+  works on the (target_size^2, 4) samples. Returns the output pixels together
+  with the content bbox, its square expansion, and the aligned sample region.
+  """
+  height, width = arr.shape[:2]
+  background_rgb = None
+  if background_color is not None:
+    background_rgb = np.array(background_color[:3], dtype=np.int16)
+
+  bbox = _content_bbox(arr, background_rgb, background_threshold)
+  square = expand_to_square(bbox, (width, height))
+  sample_region, aligned_pixel_size = align_sample_region(
+      square, target_size, (width, height), pixel_size
+  )
+
+  output_pixels = sample_centers(arr, sample_region, target_size, aligned_pixel_size)
+  if tolerance is not None:
+    output_pixels = merge_palette(output_pixels, tolerance)
+
+  if background_rgb is not None:
+    close = close_mask(output_pixels[:, :3], background_rgb, background_threshold)
+    output_pixels[close & (output_pixels[:, 3] != 0), 3] = 0
+
+  return output_pixels, bbox, square, sample_region
+
+
+def _draft_scale(image: Image.Image, pixel_size: int) -> int:
+  """Request a reduced-size decode whose scale divides `pixel_size`.
+
+  JPEG decoders can shrink by 1/2, 1/4 or 1/8 during decoding; other formats
+  ignore the request. Returns the scale factor actually applied.
+  """
+  max_scale = min(8, pixel_size & -pixel_size)
+  if max_scale < 2:
+    return 1
+
+  width, height = image.size
+  requested = (width // max_scale, height // max_scale)
+  if min(requested) < 1:
+    return 1
+
+  image.draft("RGB", requested)
+  scale = max_scale
+  while scale >= 1:
+    if image.size == (-(-width // scale), -(-height // scale)):
+      return scale
+    scale //= 2
+  raise ValueError(
+      f"Unexpected draft size {image.size} for a {width}x{height} source image."
+  )
+
+
+def _scale_bbox(bbox: BBox, scale: int, image_size: Tuple[int, int]) -> BBox:
+  """Map a bbox from a draft-decoded image back to source coordinates."""
+  left, top, right, bottom = bbox
+  img_w, img_h = image_size
+  return (
+      min(left * scale, img_w),
+      min(top * scale, img_h),
+      min(right * scale, img_w),
+      min(bottom * scale, img_h),
+  )
 
 
 def downscale(
@@ -515,46 +680,54 @@ def downscale(
     tolerance: float | None,
     debug_grid: bool,
     background_threshold: int = BACKGROUND_THRESHOLD,
+    fast_decode: bool = False,
 ) -> None:
-  image = Image.open(input_path).convert("RGBA")
+  image = Image.open(input_path)
+  source_width, source_height = image.size
+  scale = _draft_scale(image, pixel_size) if fast_decode else 1
+  decoded_pixel_size = pixel_size // scale
 
-  alpha_min, alpha_max = image.getchannel("A").getextrema()
-  background_color = None
-  if alpha_min == alpha_max == 255:
-    background_color = detect_background_color(image)
+  image = image.convert("RGBA")
+  arr = np.asarray(image)
 
-  bbox = detect_content_bbox(image, background_threshold=background_threshold)
-  square = expand_to_square(bbox, image.size)
-  sample_region, aligned_pixel_size = align_sample_region(
-      square, target_size, image.size, pixel_size
+  alpha = arr[:, :, 3]
+  if alpha.max() == 0:
+    raise ValueError("Image contains no visible pixels.")
+  background_color = None
+  if alpha.min() == 255:
+    background_color = detect_background_color(arr)
+
+  output_pixels, bbox, square, sample_region = _analyze_and_sample(
+      arr,
+      target_size,
+      decoded_pixel_size,
+      tolerance,
+      background_color,
+      background_threshold,
   )
 
-  centers = sample_centers(image, sample_region, target_size, aligned_pixel_size)
-  if tolerance is None:
-    output_pixels = centers
-  else:
-    output_pixels = merge_palette(centers, tolerance)
-
-  if background_color is not None:
-    output_pixels = [
-        (p[0], p[1], p[2], 0)
-        if p[3] != 0 and _color_close(p, background_color, threshold=background_threshold)
-        else p
-        for p in output_pixels
-    ]
-
   write_output(output_path, target_size, output_pixels)
+  if scale > 1:
+    source_size = (source_width, source_height)
+    bbox = _scale_bbox(bbox, scale, source_size)
+    square = _scale_bbox(square, scale, source_size)
+    sample_region = _scale_bbox(sample_region, scale, source_size)
   if debug_grid:
+    # Draw on a full-resolution decode so the overlay matches the logged coordinates.
+    if scale > 1:
+      image = Image.open(input_path).convert("RGBA")
     debug_path = output_path.with_name(f"{output_path.stem}_debug.png")
-    write_debug_overlay(image, sample_region, aligned_pixel_size, target_size, debug_path)
+    write_debug_overlay(image, sample_region, pixel_size, target_size, debug_path)
     print(f"Wrote debug overlay to {debug_path}")
-  print(f"Input: {image.width}x{image.height}")
+  print(f"Input: {source_width}x{source_height}")
+  if scale > 1:
+    print(f"Decoded at 1/{scale} scale: {arr.shape[1]}x{arr.shape[0]}")
   if background_color is not None:
     print(f"Background color: {background_color}")
   print(f"Content bbox: {bbox}")
   print(f"Square region: {square}")
-  print(f"Using pixel size: {aligned_pixel_size}")
-  print(f"Aligned region: {sample_region} (pixel size: {aligned_pixel_size})")
+  print(f"Using pixel size: {pixel_size}")
+  print(f"Aligned region: {sample_region} (pixel size: {pixel_size})")
 
 
 def default_output_path(input_path: pathlib.Path, mode: str) -> pathlib.Path:
@@ -574,15 +747,37 @@ def grid_overlay_path(output_path: pathlib.Path) -> pathlib.Path:
   return output_path.with_name(f"{stem}_grid_overlay{output_path.suffix}")
 
 
-def main() -> None:
-  args = parse_args()
-  output_path = args.output if args.output is not None else default_output_path(
-      args.input, args.mode
-  )
+def collect_inputs(input_path: pathlib.Path) -> List[pathlib.Path]:
+  """Expand `--input` into image paths: a single file, a directory, or a glob.
 
+  Directory and glob matches skip non-image files and this script's own outputs.
+  """
+  if input_path.is_file():
+    return [input_path]
+
+  pattern = str(input_path)
+  if input_path.is_dir():
+    candidates = sorted(input_path.iterdir())
+  elif any(ch in pattern for ch in "*?["):
+    candidates = sorted(pathlib.Path(p) for p in glob.glob(pattern, recursive=True))
+  else:
+    return [input_path]
+
+  extensions = Image.registered_extensions()
+  return [
+      path for path in candidates
+      if path.is_file() and
+      path.suffix.lower() in extensions and
+      not path.stem.endswith(GENERATED_SUFFIXES)
+  ]
+
+
+def process_image(
+    args: argparse.Namespace, input_path: pathlib.Path, output_path: pathlib.Path
+) -> None:
   if args.mode == "crop":
     crop_to_content(
-        args.input,
+        input_path,
         output_path,
         args.bg_threshold,
         target_size=args.size,
@@ -591,20 +786,93 @@ def main() -> None:
     )
     return
 
-  if args.pixel_size is None:
-    raise SystemExit("`--pixel-size` is required when --mode=downscale.")
-
   downscale(
-      args.input,
+      input_path,
       output_path,
       args.size,
       args.pixel_size,
       args.tolerance,
       args.debug_grid,
       background_threshold=args.bg_threshold,
+      fast_decode=args.fast_decode,
   )
   print(f"Wrote {output_path} ({args.size}x{args.size})")
 
 
+def _run_batch_job(
+    job: Tuple[argparse.Namespace, pathlib.Path, pathlib.Path]
+) -> Tuple[bool, str]:
+  """Process one image in a worker, returning whether it succeeded and its log.
+
+  The log is captured so output from concurrent workers is not interleaved.
+  """
+  args, input_path, output_path = job
+  log = io.StringIO()
+  succeeded = True
+  with contextlib.redirect_stdout(log):
+    print(f"== {input_path}")
+    try:
+      process_image(args, input_path, output_path)
+    except Exception as exc:  # one bad asset must not abort the whole batch
+      print(f"Skipped {input_path}: {type(exc).__name__}: {exc}")
+      succeeded = False
+  return succeeded, log.getvalue()
+
+
+def main() -> None:
+  args = parse_args()
+  if args.mode == "downscale" and args.pixel_size is None:
+    raise SystemExit("`--pixel-size` is required when --mode=downscale.")
+  if args.jobs is not None and args.jobs < 1:
+    raise SystemExit("`--jobs` must be at least 1.")
+
+  inputs = collect_inputs(args.input)
+  if not inputs:
+    raise SystemExit(f"No images found for {args.input}.")
+
+  if len(inputs) == 1 and inputs[0] == args.input:
+    output_path = args.output if args.output is not None else default_output_path(
+        args.input, args.mode
+    )
+    process_image(args, args.input, output_path)
+    return
+
+  jobs = []
+  for input_path in inputs:
+    output_path = default_output_path(input_path, args.mode)
+    if args.output is not None:
+      output_path = args.output / output_path.name
+    jobs.append((args, input_path, output_path))
+
+  sources_by_output = {}
+  for _, input_path, output_path in jobs:
+    sources_by_output.setdefault(output_path, []).append(input_path)
+  collisions = {
+      output: sources for output, sources in sources_by_output.items()
+      if len(sources) > 1
+  }
+  if collisions:
+    lines = [
+        f"  {output}: {', '.join(str(source) for source in sources)}"
+        for output, sources in collisions.items()
+    ]
+    raise SystemExit(
+        "Multiple inputs would write the same output file:\n" + "\n".join(lines)
+    )
+
+  if args.output is not None:
+    args.output.mkdir(parents=True, exist_ok=True)
+
+  failures = 0
+  with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+    for succeeded, log in executor.map(_run_batch_job, jobs):
+      print(log, end="")
+      if not succeeded:
+        failures += 1
+
+  if failures:
+    raise SystemExit(f"{failures} of {len(jobs)} images failed.")
+
+
 if __name__ == "__main__":
   main()